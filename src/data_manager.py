@@ -1,9 +1,18 @@
 import json
 import os
+import sys
 import pandas as pd
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 import streamlit as st # Import streamlit to use st.error
 
+# Optional fast parser for newline-delimited JSON; falls back to the standard library
+try:
+    import orjson
+    _parse_json_line = orjson.loads
+except ImportError:
+    orjson = None
+    _parse_json_line = json.loads
+
 DATA_DIR = "data"
 TASKS_FILE = os.path.join(DATA_DIR, "tasks.json")
 WORKERS_FILE = os.path.join(DATA_DIR, "workers.json")
@@ -12,6 +21,12 @@ WORKERS_FILE = os.path.join(DATA_DIR, "workers.json")
 SOURCE_DUMMY_TASKS_FILE = os.path.join(DATA_DIR, "dummy_tasks.json")
 SOURCE_DUMMY_WORKERS_FILE = os.path.join(DATA_DIR, "dummy_workers.json")
 
+# Files with these extensions hold one compact JSON record per line (newline-delimited JSON)
+NDJSON_EXTENSIONS = (".jsonl", ".ndjson")
+
+# Fields kept when normalizing streamed records into their compact in-memory form
+_RECORD_FIELDS = ("name", "required_skills", "available_skills", "score", "max_shifts")
+
 # In-memory storage for tasks and workers
 _tasks: List[Dict[str, Any]] = []
 _workers: List[Dict[str, Any]] = []
@@ -20,15 +35,69 @@ def _ensure_data_directory():
     """Ensures the data directory exists."""
     os.makedirs(DATA_DIR, exist_ok=True)
 
+def _is_ndjson_file(filename: str) -> bool:
+    """Returns True if the file should be read and written as newline-delimited JSON."""
+    return filename.lower().endswith(NDJSON_EXTENSIONS)
+
 def save_data(data: List[Dict[str, Any]], filename: str):
-    """Saves data to a JSON file."""
+    """Saves data to a JSON file, or one compact record per line for .jsonl/.ndjson files."""
     _ensure_data_directory()
     with open(filename, 'w') as f:
-        json.dump(data, f, indent=4)
+        if _is_ndjson_file(filename):
+            for record in data:
+                f.write(json.dumps(record, separators=(',', ':')))
+                f.write("\n")
+        else:
+            json.dump(data, f, indent=4)
+
+def _normalize_record(record: Any) -> Optional[Dict[str, Any]]:
+    """Reduces a task/worker record to its known fields, interning names and skills
+    so repeated strings across a large roster are stored only once.
+    Returns None unless the record is an object with a string name, at least one skill field
+    holding a list of strings, and integer "score"/"max_shifts" values where present."""
+    if not isinstance(record, dict) or not isinstance(record.get("name"), str):
+        return None
+    if "required_skills" not in record and "available_skills" not in record:
+        return None
+    compact = {}
+    for field in _RECORD_FIELDS:
+        if field not in record:
+            continue
+        value = record[field]
+        if field == "name":
+            value = sys.intern(value)
+        elif field in ("required_skills", "available_skills"):
+            if not isinstance(value, list) or not all(isinstance(skill, str) for skill in value):
+                return None
+            value = [sys.intern(skill) for skill in value]
+        elif field in ("score", "max_shifts"):
+            if not isinstance(value, int) or isinstance(value, bool):
+                return None
+        compact[field] = value
+    return compact
+
+def iter_records_from_ndjson(filename: str):
+    """Yields normalized records from a newline-delimited JSON file one line at a time.
+    Blank lines are ignored and malformed lines are skipped with a warning."""
+    with open(filename, 'rb') as f:
+        for line_number, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            try:
+                record = _normalize_record(_parse_json_line(line))
+            except ValueError: # json.JSONDecodeError and orjson.JSONDecodeError both subclass ValueError
+                record = None
+            if record is None:
+                print(f"Warning: {filename} line {line_number} is malformed. Skipping it.")
+                continue
+            yield record
 
 def load_data_from_file(filename: str) -> List[Dict[str, Any]]:
-    """Loads data from a JSON file. Returns empty list if file not found or corrupted."""
+    """Loads data from a JSON file. Returns empty list if file not found or corrupted.
+    .jsonl/.ndjson files are streamed line by line instead of being read whole."""
     _ensure_data_directory()
+    if os.path.exists(filename) and _is_ndjson_file(filename):
+        return list(iter_records_from_ndjson(filename))
     if os.path.exists(filename):
         try:
             with open(filename, 'r') as f:
@@ -142,11 +211,12 @@ def reset_data_from_files():
 # Ensure data directory exists and either load existing data or write dummy data from sources
 _ensure_data_directory()
 
-# If the main working files (tasks.json, workers.json) don't exist or are empty,
-# then populate them with the initial dummy data from the source files.
-if not os.path.exists(TASKS_FILE) or not os.path.exists(WORKERS_FILE) or \
-   not load_data_from_file(TASKS_FILE) or not load_data_from_file(WORKERS_FILE):
+# Load the main working files once; if either doesn't exist or is empty,
+# populate them with the initial dummy data from the source files and reload.
+_tasks = load_data_from_file(TASKS_FILE)
+_workers = load_data_from_file(WORKERS_FILE)
+if not _tasks or not _workers:
     _write_initial_dummy_data_to_files()
-
-# Load initial data into memory from the main working files
-_load_in_memory_data()
\ No newline at end of file
+    _load_in_memory_data()
+else:
+    print("In-memory data loaded from files.")
\ No newline at end of file
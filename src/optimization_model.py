@@ -1,8 +1,44 @@
+import gc
+import multiprocessing
+import os
+import queue
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
 import pyomo.environ as pyo
 from pyomo.opt import SolverFactory
-from typing import List, Dict, Tuple, Optional
+from typing import List, Dict, Tuple, Optional, Any
 
-def solve_task_allocation(tasks: List[Dict], workers: List[Dict]) -> Optional[Dict]:
+try:
+    import resource # Unix only; peak RSS is simply not reported elsewhere
+except ImportError:
+    resource = None
+
+DEFAULT_SOLVER = 'appsi_highs'
+
+# Other local MIP solvers that may join a race if SolverFactory reports them as available
+RACE_CANDIDATE_SOLVERS = ['cbc', 'glpk', 'scip', 'gurobi', 'cplex']
+
+# Rough footprint of Pyomo model components in bytes, used to estimate model size before building it.
+# These are not calibrated: measured dense builds come in at about a third of the estimate
+# (3.6 MB vs 10.7 MB at 20 tasks x 200 workers, 39 MB vs 125 MB at 50 x 1000), and the
+# difference is left as headroom for the solver-side copy of the model made during solve.
+_BYTES_PER_PARAM = 200
+_BYTES_PER_VAR = 600
+_BYTES_PER_CONSTRAINT = 1000
+_BYTES_PER_LINEAR_TERM = 150
+_BYTES_PER_MB = 1024 * 1024
+
+# Per-strategy race statistics: {strategy_name: {"races": n, "wins": k, "not_started": m}}
+_race_stats: Dict[str, Dict[str, int]] = {}
+
+# Number of races run so far; rotates the start order so capped races measure every strategy
+_race_count = 0
+
+
+def _build_model(tasks: List[Dict], workers: List[Dict]) -> pyo.ConcreteModel:
+    """Builds the Pyomo task allocation model for the given tasks and workers."""
     model = pyo.ConcreteModel()
 
     # --- Sets ---
@@ -67,44 +103,426 @@ def solve_task_allocation(tasks: List[Dict], workers: List[Dict]) -> Optional[Di
         return model.x[t, w] <= model.y[w]
     model.WorkerUsedLink = pyo.Constraint(model.TASKS, model.WORKERS, rule=worker_used_link_rule)
 
+    return model
+
+
+def run_solver(model: pyo.ConcreteModel, solver_name: str = DEFAULT_SOLVER,
+               solver_options: Optional[Dict[str, Any]] = None, warmstart: bool = False) -> bool:
+    """
+    Solves the model in place. Returns True if the solver proved optimality.
+    With `warmstart`, the current variable values are passed as a MIP start to
+    solvers that support one and ignored by the others.
+    """
+    solver = SolverFactory(solver_name)
+    if solver_options:
+        solver.options.update(solver_options)
+
+    solve_kwargs = {}
+    if warmstart and getattr(solver, "warm_start_capable", lambda: False)():
+        solve_kwargs["warmstart"] = True
+    results = solver.solve(model, tee=False, **solve_kwargs)
+
+    if (results.solver.status == pyo.SolverStatus.ok and
+            results.solver.termination_condition == pyo.TerminationCondition.optimal):
+        return True
+    print(f"Solver did not find an optimal solution. Status: {results.solver.status}, Termination Condition: {results.solver.termination_condition}")
+    return False
+
+
+def _extract_results(model: pyo.ConcreteModel) -> Dict:
+    """Reads the assignments of a solved model into a plain dictionary."""
+    allocation_results = {
+        "objective_value": pyo.value(model.objective), # This will now be a float due to the score
+        "assignments": {},
+        "workers_used": []
+    }
+
+    # Collect all assignments where x_tw is 1
+    for t in model.TASKS:
+        assigned_workers_for_task = []
+        for w in model.WORKERS:
+            if pyo.value(model.x[t, w]) > 0.5:
+                assigned_workers_for_task.append(w)
+        allocation_results["assignments"][t] = assigned_workers_for_task
+
+    for w in model.WORKERS:
+        if pyo.value(model.y[w]) > 0.5:
+            allocation_results["workers_used"].append(w)
+
+    # The objective value will be a float, so we extract the integer part for worker count
+    allocation_results["minimum_workers_count"] = int(pyo.value(sum(model.y[w] for w in model.WORKERS)))
+
+    return allocation_results
+
+
+# --- Memory-bounded solving ---
+
+def estimate_model_memory_mb(tasks: List[Dict], workers: List[Dict]) -> float:
+    """
+    Estimates the memory needed to build and solve the dense model from _build_model, in MB.
+    This is a rough, roughly 3x conservative heuristic over the Pyomo build alone, meant as a
+    threshold for choosing the lean model rather than a prediction of process memory.
+    """
+    num_tasks = len(tasks)
+    num_workers = len(workers)
+    num_skills = len({skill for task in tasks for skill in task["required_skills"]})
+    num_required = sum(len(set(task["required_skills"])) for task in tasks)
+
+    params = (num_tasks + num_workers) * num_skills + num_workers
+    variables = num_tasks * num_workers + num_workers
+    constraints = num_workers + num_required + num_tasks * num_workers
+    # OneTaskPerWorker and TaskSkillCoverage sum over tasks/workers, WorkerUsedLink has two terms each
+    terms = num_workers * num_tasks + num_required * num_workers + 2 * num_tasks * num_workers
+
+    return (params * _BYTES_PER_PARAM + variables * _BYTES_PER_VAR +
+            constraints * _BYTES_PER_CONSTRAINT + terms * _BYTES_PER_LINEAR_TERM) / _BYTES_PER_MB
+
+
+def _build_lean_model(tasks: List[Dict], workers: List[Dict]) -> pyo.ConcreteModel:
+    """
+    Builds a sparse model with the same optimum as _build_model, for instances over the memory budget.
+    No dense skill parameters are stored, x[t, w] only exists when worker w has at least one skill
+    task t needs, and the per-pair linking constraints are folded into a single
+    sum_t x[t, w] <= y[w] per worker (which also enforces one task per worker).
+    """
+    model = pyo.ConcreteModel()
+
+    task_skills = {task["name"]: set(task["required_skills"]) for task in tasks}
+    worker_skills = {worker["name"]: set(worker["available_skills"]) for worker in workers}
+    worker_score = {worker["name"]: worker.get("score", 5) for worker in workers}
+
+    workers_for_task = {t: [] for t in task_skills}
+    tasks_for_worker = {w: [] for w in worker_skills}
+    for t, required in task_skills.items():
+        for w, available in worker_skills.items():
+            if required & available:
+                workers_for_task[t].append(w)
+                tasks_for_worker[w].append(t)
+
+    # --- Sets ---
+    model.TASKS = pyo.Set(initialize=list(task_skills))
+    model.WORKERS = pyo.Set(initialize=list(worker_skills))
+    model.PAIRS = pyo.Set(initialize=[(t, w) for t in workers_for_task for w in workers_for_task[t]], dimen=2)
+
+    # --- Decision Variables ---
+    model.x = pyo.Var(model.PAIRS, within=pyo.Binary)
+    model.y = pyo.Var(model.WORKERS, within=pyo.Binary)
+
+    # --- Objective Function ---
+    model.objective = pyo.Objective(
+        expr=sum(model.y[w] for w in model.WORKERS) - 0.01 * sum(model.y[w] * worker_score[w] for w in model.WORKERS),
+        sense=pyo.minimize
+    )
+
+    # --- Constraints ---
+
+    # 1. Worker Utilization Link and One Task per Worker
+    def worker_used_link_rule(model, w):
+        if not tasks_for_worker[w]:
+            return pyo.Constraint.Skip
+        return sum(model.x[t, w] for t in tasks_for_worker[w]) <= model.y[w]
+    model.WorkerUsedLink = pyo.Constraint(model.WORKERS, rule=worker_used_link_rule)
+
+    # 2. Task Skill Coverage
+    coverage_index = [(t, skill) for t, required in task_skills.items() for skill in required]
+
+    def task_skill_coverage_rule(model, t, skill):
+        skilled_workers = [w for w in workers_for_task[t] if skill in worker_skills[w]]
+        if not skilled_workers:
+            return pyo.Constraint.Infeasible
+        return sum(model.x[t, w] for w in skilled_workers) >= 1
+    model.TaskSkillCoverage = pyo.Constraint(coverage_index, rule=task_skill_coverage_rule)
+
+    return model
+
 
-    # --- Solve the model ---
-    solver = SolverFactory('appsi_highs')
+def _read_lean_solution(model: pyo.ConcreteModel) -> Tuple[float, Dict[str, List[str]], List[str]]:
+    """Copies the solution of a lean model into plain Python objects so the model can be freed."""
+    objective_value = pyo.value(model.objective)
+    assignments = {t: [] for t in model.TASKS}
+    for t, w in model.PAIRS:
+        if pyo.value(model.x[t, w]) > 0.5:
+            assignments[t].append(w)
+    workers_used = [w for w in model.WORKERS if pyo.value(model.y[w]) > 0.5]
+    return objective_value, assignments, workers_used
 
+
+def _current_rss_mb() -> Optional[float]:
+    """Returns the current resident set size of this process in MB, or None where /proc is unavailable."""
     try:
-        results = solver.solve(model, tee=False)
+        with open("/proc/self/statm") as f:
+            resident_pages = int(f.read().split()[1])
+    except (OSError, IndexError, ValueError):
+        return None
+    return resident_pages * os.sysconf("SC_PAGE_SIZE") / _BYTES_PER_MB
+
 
-        if (results.solver.status == pyo.SolverStatus.ok and
-                results.solver.termination_condition == pyo.TerminationCondition.optimal):
+def _process_peak_rss_mb() -> Optional[float]:
+    """Returns the high-water mark of resident memory over the whole process lifetime in MB,
+    or None where it is unavailable. It never goes down, so it is not a per-phase figure."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in bytes on macOS and in kilobytes elsewhere
+    return peak / _BYTES_PER_MB if sys.platform == "darwin" else peak / 1024
 
-            allocation_results = {
-                "objective_value": pyo.value(model.objective), # This will now be a float due to the score
-                "assignments": {},
-                "workers_used": []
-            }
 
-            # Collect all assignments where x_tw is 1
-            for t in model.TASKS:
-                assigned_workers_for_task = []
-                for w in model.WORKERS:
-                    if pyo.value(model.x[t, w]) > 0.5:
-                        assigned_workers_for_task.append(w)
-                allocation_results["assignments"][t] = assigned_workers_for_task
+@contextmanager
+def _memory_phase(phases: Optional[Dict[str, Dict]], phase: str):
+    """
+    Records time, memory and RSS figures for one phase of a solve when profiling.
+    tracemalloc only sees Python allocations, so native solver memory (e.g. HiGHS's copy
+    of the model) shows up in "rss_delta_mb" but not in "allocated_mb"/"peak_mb".
+    """
+    if phases is None:
+        yield
+        return
+    tracemalloc.reset_peak()
+    start_traced, _ = tracemalloc.get_traced_memory()
+    start_rss = _current_rss_mb()
+    start_time = time.perf_counter()
+    try:
+        yield
+    finally:
+        current_traced, peak_traced = tracemalloc.get_traced_memory()
+        end_rss = _current_rss_mb()
+        phases[phase] = {
+            "seconds": time.perf_counter() - start_time,
+            "allocated_mb": (current_traced - start_traced) / _BYTES_PER_MB,
+            "peak_mb": (peak_traced - start_traced) / _BYTES_PER_MB,
+            "rss_mb": end_rss,
+            "rss_delta_mb": end_rss - start_rss if start_rss is not None and end_rss is not None else None,
+            "process_peak_rss_mb": _process_peak_rss_mb(),
+        }
 
-            for w in model.WORKERS:
-                if pyo.value(model.y[w]) > 0.5:
-                    allocation_results["workers_used"].append(w)
 
-            # The objective value will be a float, so we extract the integer part for worker count
-            allocation_results["minimum_workers_count"] = int(pyo.value(sum(model.y[w] for w in model.WORKERS)))
+def _print_memory_profile(memory_profile: Dict) -> None:
+    """Prints the memory profile of a solve that returned no result, so failed runs can still be inspected."""
+    def mb(value: Optional[float]) -> str:
+        return "n/a" if value is None else f"{value:.2f} MB"
 
-            return allocation_results
-        else:
-            print(f"Solver did not find an optimal solution. Status: {results.solver.status}, Termination Condition: {results.solver.termination_condition}")
+    print(f"Memory profile (estimated model: {mb(memory_profile['estimated_model_mb'])}, lean model: {memory_profile['lean_model']}):")
+    for phase, usage in memory_profile["phases"].items():
+        print(f"  - {phase}: traced peak {mb(usage['peak_mb'])}, RSS delta {mb(usage['rss_delta_mb'])} in {usage['seconds']:.2f}s")
+
+
+def solve_task_allocation(tasks: List[Dict], workers: List[Dict], solver_name: str = DEFAULT_SOLVER,
+                          solver_options: Optional[Dict[str, Any]] = None,
+                          memory_budget_mb: Optional[float] = None,
+                          profile_memory: bool = False) -> Optional[Dict]:
+    """
+    Solves the task allocation problem with a single solver configuration.
+    Returns the allocation results, or None if no proven-optimal solution was found.
+
+    If estimate_model_memory_mb (a rough, conservative heuristic) exceeds `memory_budget_mb`,
+    the sparse lean model is built instead and freed before the results are assembled. With `profile_memory`,
+    per-phase memory usage (build, solve, extract) is returned under "memory_profile";
+    when no result is returned, the phases recorded so far are printed instead.
+    """
+    phases: Optional[Dict[str, Dict]] = {} if profile_memory else None
+    memory_profile = {"estimated_model_mb": None, "lean_model": False, "phases": phases}
+    started_tracing = profile_memory and not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+
+    try:
+        estimated_mb = estimate_model_memory_mb(tasks, workers)
+        lean = memory_budget_mb is not None and estimated_mb > memory_budget_mb
+        memory_profile.update(estimated_model_mb=estimated_mb, lean_model=lean)
+
+        with _memory_phase(phases, "build"):
+            model = _build_lean_model(tasks, workers) if lean else _build_model(tasks, workers)
+
+        with _memory_phase(phases, "solve"):
+            solved = run_solver(model, solver_name, solver_options)
+        if not solved:
+            if phases is not None:
+                _print_memory_profile(memory_profile)
             return None
+
+        with _memory_phase(phases, "extract"):
+            if lean:
+                objective_value, assignments, workers_used = _read_lean_solution(model)
+                del model
+                gc.collect() # Release the Pyomo model before assembling the results
+                allocation_results = {
+                    "objective_value": objective_value,
+                    "assignments": assignments,
+                    "workers_used": workers_used,
+                    "minimum_workers_count": len(workers_used)
+                }
+            else:
+                allocation_results = _extract_results(model)
+
+        if phases is not None:
+            allocation_results["memory_profile"] = memory_profile
+        return allocation_results
     except Exception as e:
         print(f"An error occurred during solving: {e}")
+        if phases is not None:
+            _print_memory_profile(memory_profile)
         return None
+    finally:
+        if started_tracing:
+            tracemalloc.stop()
+
+
+# --- Solver portfolio racing ---
+
+def default_race_strategies() -> List[Dict[str, Any]]:
+    """
+    Returns the default portfolio of solver configurations to race:
+    HiGHS with a few seeds and thread/presolve settings, plus every other
+    locally available MIP solver known to SolverFactory.
+    """
+    strategies = [
+        {"name": "highs_seed0", "solver": DEFAULT_SOLVER, "options": {"random_seed": 0}},
+        {"name": "highs_seed1", "solver": DEFAULT_SOLVER, "options": {"random_seed": 1}},
+        {"name": "highs_seed2_single_thread", "solver": DEFAULT_SOLVER, "options": {"random_seed": 2, "threads": 1}},
+        {"name": "highs_no_presolve", "solver": DEFAULT_SOLVER, "options": {"presolve": "off"}},
+    ]
+    for solver_name in RACE_CANDIDATE_SOLVERS:
+        try:
+            available = SolverFactory(solver_name).available(exception_flag=False)
+        except Exception:
+            available = False
+        if available:
+            strategies.append({"name": solver_name, "solver": solver_name, "options": {}})
+    return strategies
+
+
+def _race_worker(strategy: Dict[str, Any], tasks: List[Dict], workers: List[Dict], result_queue,
+                 memory_budget_mb: Optional[float] = None) -> None:
+    """Runs one race strategy in a child process and reports its result on the queue."""
+    try:
+        result = solve_task_allocation(tasks, workers, strategy["solver"], strategy.get("options"),
+                                       memory_budget_mb=memory_budget_mb)
+    except Exception as e:
+        print(f"Race strategy {strategy['name']} failed: {e}")
+        result = None
+    result_queue.put((strategy["name"], result))
+
+
+def solve_task_allocation_race(tasks: List[Dict], workers: List[Dict],
+                               strategies: Optional[List[Dict[str, Any]]] = None,
+                               timeout: Optional[float] = None,
+                               max_processes: Optional[int] = None,
+                               memory_budget_mb: Optional[float] = None) -> Optional[Dict]:
+    """
+    Races several solver configurations in parallel processes.
+    At most `max_processes` strategies (default: the number of CPUs) run at once; the
+    others start as earlier ones finish without a result. The start order rotates from
+    one race to the next so every strategy gets to start first in turn, and HiGHS
+    strategies without an explicit "threads" option share the CPUs between the
+    concurrent processes instead of each starting a full thread pool. `memory_budget_mb`
+    is passed to each child's solve_task_allocation, so every process can switch to the
+    lean model on its own.
+    The first strategy to return a proven-optimal result wins and the remaining
+    processes are terminated. The winner's name is stored under "strategy" in the
+    returned results. Returns None if no strategy finds an optimal solution
+    (or none does so within `timeout` seconds).
+    """
+    if strategies is None:
+        strategies = default_race_strategies()
+    if not strategies:
+        return None
+    if max_processes is None:
+        max_processes = os.cpu_count() or 1
+    max_processes = max(1, min(max_processes, len(strategies)))
+
+    global _race_count
+    offset = _race_count % len(strategies)
+    _race_count += 1
+    pending = strategies[offset:] + strategies[:offset]
+
+    if max_processes > 1:
+        threads_per_process = max(1, (os.cpu_count() or 1) // max_processes)
+        pending = [
+            {**strategy, "options": {"threads": threads_per_process, **(strategy.get("options") or {})}}
+            if strategy["solver"] == DEFAULT_SOLVER else strategy
+            for strategy in pending
+        ]
+
+    ctx = multiprocessing.get_context("spawn")
+    result_queue = ctx.Queue()
+    processes = []
+    started_names = []
+
+    deadline = time.monotonic() + timeout if timeout is not None else None
+    winner: Optional[Tuple[str, Dict]] = None
+    try:
+        while True:
+            # Fill free slots with the next strategies in the portfolio
+            while pending and sum(process.is_alive() for process in processes) < max_processes:
+                strategy = pending.pop(0)
+                process = ctx.Process(target=_race_worker,
+                                      args=(strategy, tasks, workers, result_queue, memory_budget_mb),
+                                      daemon=True)
+                process.start()
+                processes.append(process)
+                started_names.append(strategy["name"])
+
+            if deadline is not None and time.monotonic() >= deadline:
+                print("Solver race timed out without a proven-optimal result.")
+                break
+            try:
+                strategy_name, result = result_queue.get(timeout=0.1)
+            except queue.Empty:
+                # A child killed from outside (e.g. OOM) never reports; stop waiting once all are gone
+                if not pending and not any(process.is_alive() for process in processes) and result_queue.empty():
+                    break
+                continue
+            if result is not None:
+                winner = (strategy_name, result)
+                break
+            if not pending and not any(process.is_alive() for process in processes) and result_queue.empty():
+                break
+    finally:
+        for process in processes:
+            if process.is_alive():
+                process.terminate()
+        for process in processes:
+            process.join()
+
+    for strategy in strategies:
+        stats = _race_stats.setdefault(strategy["name"], {"races": 0, "wins": 0, "not_started": 0})
+        if strategy["name"] in started_names:
+            stats["races"] += 1
+        else:
+            stats["not_started"] += 1
+    if winner is None:
+        return None
+
+    strategy_name, result = winner
+    _race_stats[strategy_name]["wins"] += 1
+    result["strategy"] = strategy_name
+    return result
+
+
+def get_race_win_rates() -> Dict[str, float]:
+    """
+    Returns the fraction of races won by each strategy out of the races it actually started in.
+    Races where a strategy was still queued when the race ended are counted under
+    "not_started" in get_race_stats() and left out of its rate.
+    """
+    return {
+        name: stats["wins"] / stats["races"]
+        for name, stats in _race_stats.items()
+        if stats["races"]
+    }
+
+
+def get_race_stats() -> Dict[str, Dict[str, int]]:
+    """Returns a copy of the raw per-strategy race counts."""
+    return {name: dict(stats) for name, stats in _race_stats.items()}
+
+
+def reset_race_stats():
+    """Clears the accumulated race statistics and the start-order rotation."""
+    global _race_count
+    _race_stats.clear()
+    _race_count = 0
+
 
 # Example usage (for testing optimization_model.py independently)
 if __name__ == "__main__":
@@ -144,4 +562,22 @@ if __name__ == "__main__":
     ]
     infeasible_results = solve_task_allocation(infeasible_tasks, infeasible_workers)
     if not infeasible_results:
-        print("\nCorrectly identified infeasible case (Task X requires skill not available).")
\ No newline at end of file
+        print("\nCorrectly identified infeasible case (Task X requires skill not available).")
+
+    print("\n--- Racing solver configurations ---")
+    for _ in range(len(default_race_strategies())):
+        race_results = solve_task_allocation_race(sample_tasks, sample_workers)
+        if race_results:
+            print(f"Winning strategy: {race_results['strategy']} (Minimum Workers Used: {race_results['minimum_workers_count']})")
+    win_rates = get_race_win_rates()
+    print("Strategy win rates:")
+    for name, stats in get_race_stats().items():
+        print(f"  - {name}: {win_rates.get(name, 0):.0%} of {stats['races']} started races ({stats['not_started']} not started)")
+
+    print("\n--- Memory-bounded solve (lean model forced by a zero budget) ---")
+    lean_results = solve_task_allocation(sample_tasks, sample_workers, memory_budget_mb=0, profile_memory=True)
+    if lean_results:
+        memory_profile = lean_results["memory_profile"]
+        print(f"Minimum Workers Used: {lean_results['minimum_workers_count']} (lean model: {memory_profile['lean_model']})")
+        for phase, usage in memory_profile["phases"].items():
+            print(f"  - {phase}: peak {usage['peak_mb']:.2f} MB in {usage['seconds']:.2f}s")
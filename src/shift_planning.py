@@ -0,0 +1,254 @@
+import pyomo.environ as pyo
+from typing import List, Dict, Optional, Any
+
+from src.optimization_model import DEFAULT_SOLVER, run_solver
+
+# Score used for workers that have no "score" field, matching solve_task_allocation
+DEFAULT_WORKER_SCORE = 5
+
+
+def _build_window_model(window: List[Dict], workers_by_name: Dict[str, Dict],
+                        remaining_shifts: Dict[str, Optional[int]]) -> pyo.ConcreteModel:
+    """
+    Builds one rolling-horizon window: the task allocation model for every shift
+    in the window, linked by each worker's remaining shift allowance.
+    Shifts are indexed by their position in the window, so task names may repeat across shifts.
+    Like _build_lean_model, x[s, t, w] only exists when worker w has a skill task t needs,
+    and there is a single linking row per (shift, worker).
+    """
+    model = pyo.ConcreteModel()
+
+    worker_skills = {w: set(worker["available_skills"]) for w, worker in workers_by_name.items()}
+
+    # Skill-compatible workers for every task of every shift in the window
+    workers_for_task = {}
+    tasks_for_worker = {}
+    for s, shift in enumerate(window):
+        available = shift.get("available_workers")
+        names = available if available is not None else list(workers_by_name)
+        shift_workers = [w for w in names if w in workers_by_name and remaining_shifts.get(w) != 0]
+        for task in shift["tasks"]:
+            required = set(task["required_skills"])
+            compatible = [w for w in shift_workers if required & worker_skills[w]]
+            workers_for_task[s, task["name"]] = compatible
+            for w in compatible:
+                tasks_for_worker.setdefault((s, w), []).append(task["name"])
+
+    # --- Sets ---
+    model.SHIFT_WORKERS = pyo.Set(initialize=list(tasks_for_worker), dimen=2)
+    model.ASSIGNABLE = pyo.Set(initialize=[
+        (s, t, w) for (s, t), compatible in workers_for_task.items() for w in compatible
+    ], dimen=3)
+
+    # --- Decision Variables ---
+    model.x = pyo.Var(model.ASSIGNABLE, within=pyo.Binary)
+    model.y = pyo.Var(model.SHIFT_WORKERS, within=pyo.Binary)
+
+    # --- Objective Function ---
+    # Same weighting as solve_task_allocation, summed over every shift in the window
+    model.objective = pyo.Objective(
+        expr=sum(model.y[s, w] for s, w in model.SHIFT_WORKERS)
+        - 0.01 * sum(model.y[s, w] * workers_by_name[w].get("score", DEFAULT_WORKER_SCORE) for s, w in model.SHIFT_WORKERS),
+        sense=pyo.minimize
+    )
+
+    # --- Constraints ---
+
+    # 1. Worker Utilization Link and One Task per Worker per Shift
+    def worker_used_link_rule(model, s, w):
+        return sum(model.x[s, t, w] for t in tasks_for_worker[s, w]) <= model.y[s, w]
+    model.WorkerUsedLink = pyo.Constraint(model.SHIFT_WORKERS, rule=worker_used_link_rule)
+
+    # 2. Task Skill Coverage
+    coverage_index = [
+        (s, task["name"], skill)
+        for s, shift in enumerate(window) for task in shift["tasks"]
+        for skill in set(task["required_skills"])
+    ]
+
+    def task_skill_coverage_rule(model, s, t, skill):
+        skilled_workers = [w for w in workers_for_task[s, t] if skill in worker_skills[w]]
+        if not skilled_workers:
+            return pyo.Constraint.Infeasible # Nobody left in this shift can cover the skill
+        return sum(model.x[s, t, w] for w in skilled_workers) >= 1
+    model.TaskSkillCoverage = pyo.Constraint(coverage_index, rule=task_skill_coverage_rule)
+
+    # 3. Max-Shifts Limit across the window, only where a worker could exceed it
+    shifts_for_worker = {}
+    for s, w in tasks_for_worker:
+        shifts_for_worker.setdefault(w, []).append(s)
+    limited_workers = sorted(
+        w for w, worker_shifts in shifts_for_worker.items()
+        if remaining_shifts.get(w) is not None and len(worker_shifts) > remaining_shifts[w]
+    )
+
+    def max_shifts_rule(model, w):
+        return sum(model.y[s, w] for s in shifts_for_worker[w]) <= remaining_shifts[w]
+    model.MaxShifts = pyo.Constraint(limited_workers, rule=max_shifts_rule)
+
+    return model
+
+
+def _extract_shift_results(model: pyo.ConcreteModel, window: List[Dict], s: int) -> Dict:
+    """Reads the solution for shift `s` of a solved window in the format of solve_task_allocation."""
+    shift_results = {
+        "objective_value": 0.0,
+        "assignments": {task["name"]: [] for task in window[s]["tasks"]},
+        "workers_used": []
+    }
+
+    for shift_index, t, w in model.ASSIGNABLE:
+        if shift_index == s and pyo.value(model.x[shift_index, t, w]) > 0.5:
+            shift_results["assignments"][t].append(w)
+
+    for shift_index, w in model.SHIFT_WORKERS:
+        if shift_index == s and pyo.value(model.y[shift_index, w]) > 0.5:
+            shift_results["workers_used"].append(w)
+
+    shift_results["minimum_workers_count"] = len(shift_results["workers_used"])
+    return shift_results
+
+
+def _set_warm_start(model: pyo.ConcreteModel, window: List[Dict], workers_by_name: Dict[str, Dict],
+                    remaining_shifts: Dict[str, Optional[int]], lookahead: Dict) -> bool:
+    """
+    Seeds a full MIP start for the window. Shift 0 takes the plan the previous window made for it
+    as lookahead, which respected the allowances that remain after fixing the previous shift.
+    Later shifts get a greedy plan: for each task, repeatedly add the compatible, unused worker
+    with allowance left who covers the most still-uncovered skills (higher score first on ties).
+    Every variable gets a value, since solvers such as appsi_highs treat unset ones as 0.
+    Returns False, leaving the model without a start, if the greedy plan cannot cover a shift.
+    """
+    workers_for_task = {}
+    for s, t, w in model.ASSIGNABLE:
+        workers_for_task.setdefault((s, t), []).append(w)
+
+    plan = {(0, t, w) for t, workers_list in lookahead["assignments"].items() for w in workers_list}
+    shifts_used = {w: 1 for w in lookahead["workers_used"]}
+
+    for s in range(1, len(window)):
+        busy = set()
+        for task in window[s]["tasks"]:
+            uncovered = set(task["required_skills"])
+            while uncovered:
+                candidates = [
+                    w for w in workers_for_task.get((s, task["name"]), [])
+                    if w not in busy and (remaining_shifts.get(w) is None or shifts_used.get(w, 0) < remaining_shifts[w])
+                ]
+                best = max(candidates, default=None, key=lambda w: (
+                    len(uncovered & set(workers_by_name[w]["available_skills"])),
+                    workers_by_name[w].get("score", DEFAULT_WORKER_SCORE)
+                ))
+                if best is None or not uncovered & set(workers_by_name[best]["available_skills"]):
+                    return False
+                uncovered -= set(workers_by_name[best]["available_skills"])
+                busy.add(best)
+                shifts_used[best] = shifts_used.get(best, 0) + 1
+                plan.add((s, task["name"], best))
+
+    used = {(s, w) for s, _, w in plan}
+    for index in model.ASSIGNABLE:
+        model.x[index].value = 1 if index in plan else 0
+    for index in model.SHIFT_WORKERS:
+        model.y[index].value = 1 if index in used else 0
+    return True
+
+
+def solve_multi_shift_allocation(shifts: List[Dict], workers: List[Dict], window_size: int = 2,
+                                 max_shifts_per_worker: Optional[int] = None,
+                                 solver_name: str = DEFAULT_SOLVER,
+                                 solver_options: Optional[Dict[str, Any]] = None) -> Dict:
+    """
+    Plans a sequence of shifts with a rolling horizon.
+
+    Each shift is a dict with a "name", its "tasks" (same format as solve_task_allocation)
+    and an optional "available_workers" list of worker names (all workers if omitted).
+    A worker may carry a "max_shifts" field; otherwise `max_shifts_per_worker` applies
+    (None means unlimited).
+
+    Each step solves the next `window_size` shifts together, fixes the first shift of the
+    window and rolls forward, so the problem grows with the window rather than the horizon.
+    The plan a window makes for its second shift, completed greedily for the shifts after it,
+    warm-starts the next window.
+    If a window is infeasible, the current shift is retried on its own before being
+    reported as unplanned (None).
+    """
+    workers_by_name = {worker["name"]: worker for worker in workers}
+    remaining_shifts: Dict[str, Optional[int]] = {
+        worker["name"]: worker.get("max_shifts", max_shifts_per_worker) for worker in workers
+    }
+    window_size = max(1, window_size)
+
+    schedule = {
+        "shifts": {},
+        "worker_shift_counts": {worker["name"]: 0 for worker in workers},
+        "objective_value": 0.0,
+        "total_worker_shifts": 0,
+        "unplanned_shifts": []
+    }
+
+    lookahead = None
+    for start in range(len(shifts)):
+        shift_results = None
+        next_lookahead = None
+        # Retry the shift on its own only if the window actually covered more than one shift
+        sizes = [window_size, 1] if min(window_size, len(shifts) - start) > 1 else [1]
+        for size in sizes:
+            window = shifts[start:start + size]
+            try:
+                model = _build_window_model(window, workers_by_name, remaining_shifts)
+                warmstart = lookahead is not None and _set_warm_start(
+                    model, window, workers_by_name, remaining_shifts, lookahead)
+                if run_solver(model, solver_name, solver_options, warmstart=warmstart):
+                    shift_results = _extract_shift_results(model, window, 0)
+                    if len(window) > 1:
+                        next_lookahead = _extract_shift_results(model, window, 1)
+                    break
+            except Exception as e:
+                print(f"An error occurred while solving shift {shifts[start]['name']}: {e}")
+        lookahead = next_lookahead
+
+        shift_name = shifts[start]["name"]
+        schedule["shifts"][shift_name] = shift_results
+        if shift_results is None:
+            schedule["unplanned_shifts"].append(shift_name)
+            continue
+
+        # Fix this shift's decisions by charging them against the remaining allowances
+        for w in shift_results["workers_used"]:
+            schedule["worker_shift_counts"][w] += 1
+            if remaining_shifts[w] is not None:
+                remaining_shifts[w] -= 1
+            shift_results["objective_value"] += 1 - 0.01 * workers_by_name[w].get("score", DEFAULT_WORKER_SCORE)
+
+        schedule["objective_value"] += shift_results["objective_value"]
+        schedule["total_worker_shifts"] += shift_results["minimum_workers_count"]
+
+    return schedule
+
+
+# Example usage (for testing shift_planning.py independently)
+if __name__ == "__main__":
+    sample_workers = [
+        {"name": "Alice", "available_skills": ["S1"], "score": 8, "max_shifts": 2},
+        {"name": "Bob", "available_skills": ["S2"], "score": 6},
+        {"name": "Charlie", "available_skills": ["S3"], "score": 4},
+        {"name": "David", "available_skills": ["S1", "S2", "S3"], "score": 9, "max_shifts": 1},
+    ]
+    sample_shifts = [
+        {"name": f"Day {day}", "tasks": [
+            {"name": "Task A (S1, S2)", "required_skills": ["S1", "S2"]},
+            {"name": "Task B (S3)", "required_skills": ["S3"]},
+        ]}
+        for day in range(1, 4)
+    ]
+
+    schedule = solve_multi_shift_allocation(sample_shifts, sample_workers, max_shifts_per_worker=3)
+    for shift_name, shift_results in schedule["shifts"].items():
+        if shift_results is None:
+            print(f"{shift_name}: no feasible plan")
+            continue
+        print(f"{shift_name}:")
+        for task, workers_list in shift_results["assignments"].items():
+            print(f"  - {task}: {', '.join(workers_list)}")
+    print(f"Worker shift counts: {schedule['worker_shift_counts']}")